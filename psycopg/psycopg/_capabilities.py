@@ -72,9 +72,8 @@ class Capabilities:
 
         The expletive messages, are left to the user.
         """
-        if feature in self._cache:
-            msg = self._cache[feature]
-        else:
+        msg = self._cache.get(feature)
+        if msg is None:
             msg = self._get_unsupported_message(feature, want_version)
             self._cache[feature] = msg
 
@@ -91,16 +90,20 @@ class Capabilities:
 
         Return an empty string if the feature is supported.
         """
-        if pq.version() < want_version:
+        version = pq.version()
+        if want_version <= min(version, pq.__build_version__):
+            return ""
+
+        elif version < want_version:
             return (
                 f"the feature '{feature}' is not available:"
                 f" the client libpq version (imported from {self._libpq_source()})"
-                f" is {pq.version_pretty(pq.version())}; the feature"
+                f" is {pq.version_pretty(version)}; the feature"
                 f" requires libpq version {pq.version_pretty(want_version)}"
                 " or newer"
             )
 
-        elif pq.__build_version__ < want_version:
+        else:
             return (
                 f"the feature '{feature}' is not available:"
                 f" you are using a psycopg[{pq.__impl__}] libpq wrapper built"
@@ -108,8 +111,6 @@ class Capabilities:
                 " the feature requires libpq version"
                 f" {pq.version_pretty(want_version)} or newer"
             )
-        else:
-            return ""
 
     def _libpq_source(self) -> str:
         """Return a string reporting where the libpq comes from."""
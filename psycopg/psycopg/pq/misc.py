@@ -4,17 +4,15 @@ Various functionalities to make easier to work with the libpq.
 
 # Copyright (C) 2020 The Psycopg Team
 
-import re
 import os
 import sys
 import logging
-import ctypes.util
 from typing import cast, NamedTuple, Optional, Union
 
 from .abc import PGconn, PGresult
 from ._enums import ConnStatus, TransactionStatus, PipelineStatus
 from .._compat import cache
-from .._encodings import pgconn_encoding
+from .._encodings import pg2pyenc
 
 logger = logging.getLogger("psycopg.pq")
 
@@ -47,8 +45,21 @@ class PGresAttDesc(NamedTuple):
     atttypmod: int
 
 
+# Where Homebrew and MacPorts install libpq, which is not linked in a standard
+# library directory.
+_DARWIN_LIBPQ_PATHS = (
+    "/opt/homebrew/opt/libpq/lib/libpq.dylib",
+    "/usr/local/opt/libpq/lib/libpq.dylib",
+    "/opt/local/lib/libpq.dylib",
+)
+
+
 @cache
 def find_libpq_full_path() -> Optional[str]:
+    # Imported here: the module is only needed by the ctypes implementation,
+    # and it imports subprocess and shutil as well.
+    import ctypes.util
+
     if sys.platform == "win32":
         libname = ctypes.util.find_library("libpq.dll")
 
@@ -56,17 +67,15 @@ def find_libpq_full_path() -> Optional[str]:
         libname = ctypes.util.find_library("libpq.dylib")
         # (hopefully) temporary hack: libpq not in a standard place
         # https://github.com/orgs/Homebrew/discussions/3595
-        # If pg_config is available and agrees, let's use its indications.
+        # Look for it where the package managers install it, otherwise, if
+        # pg_config is available and agrees, let's use its indications.
         if not libname:
-            try:
-                import subprocess as sp
-
-                libdir = sp.check_output(["pg_config", "--libdir"]).strip().decode()
-                libname = os.path.join(libdir, "libpq.dylib")
-                if not os.path.exists(libname):
-                    libname = None
-            except Exception as ex:
-                logger.debug("couldn't use pg_config to find libpq: %s", ex)
+            for path in _DARWIN_LIBPQ_PATHS:
+                if os.path.exists(path):
+                    libname = path
+                    break
+            else:
+                libname = _find_libpq_from_pg_config()
 
     else:
         libname = ctypes.util.find_library("pq")
@@ -74,6 +83,26 @@ def find_libpq_full_path() -> Optional[str]:
     return libname
 
 
+def _find_libpq_from_pg_config() -> Optional[str]:
+    import shutil
+
+    pg_config = shutil.which("pg_config")
+    if not pg_config:
+        logger.debug("couldn't use pg_config to find libpq: not found")
+        return None
+
+    try:
+        import subprocess as sp
+
+        libdir = sp.check_output([pg_config, "--libdir"]).strip().decode()
+    except Exception as ex:
+        logger.debug("couldn't use pg_config to find libpq: %s", ex)
+        return None
+
+    libname = os.path.join(libdir, "libpq.dylib")
+    return libname if os.path.exists(libname) else None
+
+
 def error_message(obj: Union[PGconn, PGresult], encoding: str = "utf8") -> str:
     """
     Return an error message from a `PGconn` or `PGresult`.
@@ -91,14 +120,19 @@ def error_message(obj: Union[PGconn, PGresult], encoding: str = "utf8") -> str:
         obj = cast(PGresult, obj)
         bmsg = obj.error_message
 
-    elif hasattr(obj, "error_message"):
+    else:
         # obj is a PGconn
+        try:
+            bmsg = obj.error_message
+        except AttributeError:
+            raise TypeError(
+                f"PGconn or PGresult expected, got {type(obj).__name__}"
+            ) from None
         if obj.status == OK:
-            encoding = pgconn_encoding(obj)
-        bmsg = obj.error_message
-
-    else:
-        raise TypeError(f"PGconn or PGresult expected, got {type(obj).__name__}")
+            # Not using pgconn_encoding(), which would check the status again.
+            # The name conversion is cached; the parameter can't be, as
+            # the encoding can be changed by executing SET client_encoding.
+            encoding = pg2pyenc(obj.parameter_status(b"client_encoding") or b"UTF8")
 
     if bmsg:
         msg = strip_severity(bmsg.decode(encoding, "replace"))
@@ -108,75 +142,89 @@ def error_message(obj: Union[PGconn, PGresult], encoding: str = "utf8") -> str:
     return msg
 
 
-# Possible prefixes to strip for error messages, in the known localizations.
-# This regular expression is generated from PostgreSQL sources using the
+# Possible severity prefixes to strip from error messages, in the known
+# localizations. This map is generated from PostgreSQL sources using the
 # `tools/update_error_prefixes.py` script
-PREFIXES = re.compile(
+# fmt: off
+SEVERITIES = {
     # autogenerated: start
-    r"""
-    ^ (?:
-      DEBUG | INFO | HINWEIS | WARNUNG | FEHLER | LOG | FATAL | PANIK  # de
-    | DEBUG | INFO | NOTICE | WARNING | ERROR | LOG | FATAL | PANIC  # en
-    | DEBUG | INFO | NOTICE | WARNING | ERROR | LOG | FATAL | PANIC  # es
-    | DEBUG | INFO | NOTICE | ATTENTION | ERREUR | LOG | FATAL | PANIC  # fr
-    | DEBUG | INFO | NOTICE | PERINGATAN | ERROR | LOG | FATAL | PANIK  # id
-    | DEBUG | INFO | NOTIFICA | ATTENZIONE | ERRORE | LOG | FATALE | PANICO  # it
-    | DEBUG | INFO | NOTICE | WARNING | ERROR | LOG | FATAL | PANIC  # ja
-    | 디버그 | 정보 | 알림 | 경고 | 오류 | 로그 | 치명적오류 | 손상  # ko
-    | DEBUG | INFORMACJA | UWAGA | OSTRZEŻENIE | BŁĄD | DZIENNIK | KATASTROFALNY | PANIKA  # pl
-    | DEPURAÇÃO | INFO | NOTA | AVISO | ERRO | LOG | FATAL | PÂNICO  # pt_BR
-    | ОТЛАДКА | ИНФОРМАЦИЯ | ЗАМЕЧАНИЕ | ПРЕДУПРЕЖДЕНИЕ | ОШИБКА | СООБЩЕНИЕ | ВАЖНО | ПАНИКА  # ru
-    | DEBUG | INFO | NOTIS | VARNING | FEL | LOGG | FATALT | PANIK  # sv
-    | DEBUG | BİLGİ | NOT | UYARI | HATA | LOG | ÖLÜMCÜL\ \(FATAL\) | KRİTİK  # tr
-    | НАЛАГОДЖЕННЯ | ІНФОРМАЦІЯ | ПОВІДОМЛЕННЯ | ПОПЕРЕДЖЕННЯ | ПОМИЛКА | ЗАПИСУВАННЯ | ФАТАЛЬНО | ПАНІКА  # uk
-    | 调试 | 信息 | 注意 | 警告 | 错误 | 日志 | 致命错误 | 比致命错误还过分的错误  # zh_CN
-    ) : \s+
-    """,  # noqa: E501
+    "de": ("DEBUG", "INFO", "HINWEIS", "WARNUNG", "FEHLER", "LOG", "FATAL", "PANIK"),
+    "en": ("DEBUG", "INFO", "NOTICE", "WARNING", "ERROR", "LOG", "FATAL", "PANIC"),
+    "es": ("DEBUG", "INFO", "NOTICE", "WARNING", "ERROR", "LOG", "FATAL", "PANIC"),
+    "fr": ("DEBUG", "INFO", "NOTICE", "ATTENTION", "ERREUR", "LOG", "FATAL", "PANIC"),
+    "id": ("DEBUG", "INFO", "NOTICE", "PERINGATAN", "ERROR", "LOG", "FATAL", "PANIK"),
+    "it": ("DEBUG", "INFO", "NOTIFICA", "ATTENZIONE", "ERRORE", "LOG", "FATALE", "PANICO"),  # noqa: E501
+    "ja": ("DEBUG", "INFO", "NOTICE", "WARNING", "ERROR", "LOG", "FATAL", "PANIC"),
+    "ko": ("디버그", "정보", "알림", "경고", "오류", "로그", "치명적오류", "손상"),
+    "pl": ("DEBUG", "INFORMACJA", "UWAGA", "OSTRZEŻENIE", "BŁĄD", "DZIENNIK", "KATASTROFALNY", "PANIKA"),  # noqa: E501
+    "pt_BR": ("DEPURAÇÃO", "INFO", "NOTA", "AVISO", "ERRO", "LOG", "FATAL", "PÂNICO"),
+    "ru": ("ОТЛАДКА", "ИНФОРМАЦИЯ", "ЗАМЕЧАНИЕ", "ПРЕДУПРЕЖДЕНИЕ", "ОШИБКА", "СООБЩЕНИЕ", "ВАЖНО", "ПАНИКА"),  # noqa: E501
+    "sv": ("DEBUG", "INFO", "NOTIS", "VARNING", "FEL", "LOGG", "FATALT", "PANIK"),
+    "tr": ("DEBUG", "BİLGİ", "NOT", "UYARI", "HATA", "LOG", "ÖLÜMCÜL (FATAL)", "KRİTİK"),  # noqa: E501
+    "uk": ("НАЛАГОДЖЕННЯ", "ІНФОРМАЦІЯ", "ПОВІДОМЛЕННЯ", "ПОПЕРЕДЖЕННЯ", "ПОМИЛКА", "ЗАПИСУВАННЯ", "ФАТАЛЬНО", "ПАНІКА"),  # noqa: E501
+    "zh_CN": ("调试", "信息", "注意", "警告", "错误", "日志", "致命错误", "比致命错误还过分的错误"),
     # autogenerated: end
-    re.VERBOSE | re.MULTILINE,
-)
+}
+# fmt: on
+
+
+# All the known severities, in any language.
+_SEVERITIES = frozenset(sev for sevs in SEVERITIES.values() for sev in sevs)
+_MAX_SEVERITY_LEN = max(map(len, _SEVERITIES))
 
 
 def strip_severity(msg: str) -> str:
     """Strip severity and whitespaces from error message."""
-    m = PREFIXES.match(msg)
-    if m:
-        msg = msg[m.span()[1] :]
+    # The severities are plain words, followed by a colon and whitespaces:
+    # looking up the text before the first colon is enough to find them. Don't
+    # look for the colon further than where it could follow a severity.
+    i = msg.find(":", 0, _MAX_SEVERITY_LEN + 1)
+    if i >= 0 and msg[:i] in _SEVERITIES and msg[i + 1 : i + 2].isspace():
+        msg = msg[i + 1 :]
 
     return msg.strip()
 
 
+_conn_status_names = {s.value: s.name for s in ConnStatus}
+_tx_status_names = {s.value: s.name for s in TransactionStatus}
+_pipeline_status_names = {s.value: s.name for s in PipelineStatus}
+
+
 def connection_summary(pgconn: PGconn) -> str:
     """
     Return summary information on a connection.
 
     Useful for __repr__
     """
-    parts = []
-    if pgconn.status == OK:
-        # Put together the [STATUS]
-        status = TransactionStatus(pgconn.transaction_status).name
-        if pgconn.pipeline_status:
-            status += f", pipeline={PipelineStatus(pgconn.pipeline_status).name}"
-
-        # Put together the (CONNECTION)
-        if not pgconn.host.startswith(b"/"):
-            parts.append(("host", pgconn.host.decode()))
-        if pgconn.port != b"5432":
-            parts.append(("port", pgconn.port.decode()))
-        if pgconn.user != pgconn.db:
-            parts.append(("user", pgconn.user.decode()))
-        parts.append(("database", pgconn.db.decode()))
+    status = pgconn.status
+    if status != OK:
+        return f"[{_conn_status_names[status]}]"
 
-    else:
-        status = ConnStatus(pgconn.status).name
+    # Put together the [STATUS]
+    sstatus = _tx_status_names[pgconn.transaction_status]
+    if pgconn.pipeline_status:
+        sstatus += f", pipeline={_pipeline_status_names[pgconn.pipeline_status]}"
 
-    sparts = " ".join("%s=%s" % part for part in parts)
-    if sparts:
-        sparts = f" ({sparts})"
-    return f"[{status}]{sparts}"
+    # Put together the (CONNECTION). Every attribute access is a libpq call:
+    # read each of them once, and only decode the ones shown.
+    parts = []
+    host = pgconn.host
+    if not host.startswith(b"/"):
+        parts.append(("host", host.decode()))
+    port = pgconn.port
+    if port != b"5432":
+        parts.append(("port", port.decode()))
+    user = pgconn.user
+    db = pgconn.db
+    if user != db:
+        parts.append(("user", user.decode()))
+    parts.append(("database", db.decode()))
+
+    sparts = " ".join(f"{k}={v}" for k, v in parts)
+    return f"[{sstatus}] ({sparts})"
 
 
+@cache
 def version_pretty(version: int) -> str:
     """
     Return a pretty representation of a PostgreSQL version
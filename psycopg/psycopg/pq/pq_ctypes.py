@@ -1073,13 +1073,20 @@ class Conninfo:
         cls, opts: Sequence[impl.PQconninfoOption_struct]
     ) -> List[ConninfoOption]:
         rv = []
-        skws = "keyword envvar compiled val label dispchar".split()
         for opt in opts:
             if not opt.keyword:
                 break
-            d = {kw: getattr(opt, kw) for kw in skws}
-            d["dispsize"] = opt.dispsize
-            rv.append(ConninfoOption(**d))
+            rv.append(
+                ConninfoOption(
+                    opt.keyword,
+                    opt.envvar,
+                    opt.compiled,
+                    opt.val,
+                    opt.label,
+                    opt.dispchar,
+                    opt.dispsize,
+                )
+            )
 
         return rv
 
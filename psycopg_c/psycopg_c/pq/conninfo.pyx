@@ -47,13 +47,13 @@ cdef _options_from_array(libpq.PQconninfoOption *opts):
             break
         rv.append(
             ConninfoOption(
-                keyword=opt.keyword,
-                envvar=opt.envvar if opt.envvar is not NULL else None,
-                compiled=opt.compiled if opt.compiled is not NULL else None,
-                val=opt.val if opt.val is not NULL else None,
-                label=opt.label if opt.label is not NULL else None,
-                dispchar=opt.dispchar if opt.dispchar is not NULL else None,
-                dispsize=opt.dispsize,
+                opt.keyword,
+                opt.envvar if opt.envvar is not NULL else None,
+                opt.compiled if opt.compiled is not NULL else None,
+                opt.val if opt.val is not NULL else None,
+                opt.label if opt.label is not NULL else None,
+                opt.dispchar if opt.dispchar is not NULL else None,
+                opt.dispsize,
             )
         )
         i += 1
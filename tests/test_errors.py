@@ -345,6 +345,7 @@ def test_strip_severity_unstripped(msg):
         "ERROR: foo\n",
         "ERRORE: foo\nbar\n",
         "오류: foo: bar",
+        "ÖLÜMCÜL (FATAL): foo",
     ],
 )
 def test_strip_severity_l10n(msg):
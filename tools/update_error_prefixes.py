@@ -18,11 +18,11 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
 
 def main() -> None:
     args = parse_cmdline()
-    regexp = make_regexp(args.pgroot)
-    update_file(args.dest, regexp)
+    severities = make_severities(args.pgroot)
+    update_file(args.dest, severities)
 
 
-def make_regexp(pgroot: Path) -> str:
+def make_severities(pgroot: Path) -> str:
     logger.info("looking for translations in %s", pgroot)
     msgids = "DEBUG INFO NOTICE WARNING ERROR LOG FATAL PANIC".split()
     bylang = defaultdict[str, list[str]](list)
@@ -35,15 +35,14 @@ def make_regexp(pgroot: Path) -> str:
                 continue
             bylang[lang].append(entry.msgstr)
 
-    pattern = "\n    | ".join(
-        "%s  # %s" % (" | ".join(re.escape(msg) for msg in msgs), lang)
-        for lang, msgs in sorted(bylang.items())
-    )
-    return rf'''    r"""
-    ^ (?:
-      {pattern}
-    ) : \s+
-    """,  # noqa: E501'''
+    lines = []
+    for lang, msgs in sorted(bylang.items()):
+        line = '    "%s": (%s),' % (lang, ", ".join(f'"{msg}"' for msg in msgs))
+        if len(line) > 88:
+            line += "  # noqa: E501"
+        lines.append(line)
+
+    return "\n".join(lines)
 
 
 def update_file(fn: Path, content: str) -> None: